@@ -1,24 +1,34 @@
+import functools
 import os
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (at most once per process; skipped entirely when
+# the real environment is already configured, e.g. in production)
+@functools.lru_cache(maxsize=1)
+def _load_env():
+    if not os.environ.get("MSSQL_SERVER"):
+        load_dotenv(override=False)
 
+_load_env()
+
+# Read once at import; the assembled connection string below is reused for every connection.
 server = os.getenv("MSSQL_SERVER")
 database = os.getenv("MSSQL_DATABASE")
 username = os.getenv("MSSQL_USER")
 password = os.getenv("MSSQL_PASSWORD")
-driver = 'ODBC Driver 17 for SQL Server'
+driver = os.getenv("MSSQL_DRIVER", "ODBC Driver 17 for SQL Server")
 
 connection_string = f"mssql+pyodbc://{username}:{password}@{server}/{database}?driver={driver.replace(' ', '+')}"
 
-try:
-    engine = create_engine(connection_string, connect_args={'timeout': 10})
-    with engine.connect() as connection:
-        print("Connection successful!")
-except Exception as e:
-    print(f"Connection failed: {str(e)}")
+# No eager test connection here: connecting lazily keeps imports free of
+# network round-trips; pool_pre_ping validates connections on first real use.
+engine = create_engine(connection_string, connect_args={'timeout': 10}, pool_pre_ping=True)
+
+Session = sessionmaker(bind=engine)
 
-Session = sessionmaker(bind=engine)
\ No newline at end of file
+def ping():
+    """Explicit startup healthcheck; call from main if a connectivity probe is wanted."""
+    with engine.connect():
+        print("Connection successful!")
\ No newline at end of file
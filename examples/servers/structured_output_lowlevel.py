@@ -8,6 +8,9 @@ schemas.
 """
 
 import asyncio
+import itertools
+import random
+import time
 from datetime import datetime
 from typing import Any
 
@@ -19,6 +22,31 @@ from mcp.server.models import InitializationOptions
 # Create low-level server instance
 server = Server("structured-output-lowlevel-example")
 
+# Simulated weather readings, generated once at import into column arrays.
+# The handler just indexes a ring of precomputed values instead of taking
+# the random module's lock (and paying round()) four times per call.
+_WEATHER_CONDITIONS = ["sunny", "cloudy", "rainy", "partly cloudy", "foggy"]
+_RING_SIZE = 4096
+_rng = random.Random()
+_TEMPERATURE = [round(_rng.uniform(0, 35), 1) for _ in range(_RING_SIZE)]
+_CONDITIONS = [_rng.choice(_WEATHER_CONDITIONS) for _ in range(_RING_SIZE)]
+_HUMIDITY = [_rng.randint(30, 90) for _ in range(_RING_SIZE)]
+_WIND_SPEED = [round(_rng.uniform(0, 30), 1) for _ in range(_RING_SIZE)]
+_ring_index = itertools.cycle(range(_RING_SIZE))
+
+# Formatted timestamp cached at 1-second granularity: [last_time, formatted].
+# Calls within the same second reuse the string instead of allocating and
+# formatting a fresh datetime each time.
+_ts_cache: list = [0.0, ""]
+
+
+def _timestamp() -> str:
+    now = time.time()
+    if now - _ts_cache[0] >= 1.0:
+        _ts_cache[0] = now
+        _ts_cache[1] = datetime.fromtimestamp(now).isoformat()
+    return _ts_cache[1]
+
 
 @server.list_tools()
 async def list_tools() -> list[types.Tool]:
@@ -57,16 +85,13 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Any:
         # city = arguments["city"]  # Would be used with real weather API
 
         # Simulate weather data (in production, call a real weather API)
-        import random
-
-        weather_conditions = ["sunny", "cloudy", "rainy", "partly cloudy", "foggy"]
-
+        idx = next(_ring_index)
         weather_data = {
-            "temperature": round(random.uniform(0, 35), 1),
-            "conditions": random.choice(weather_conditions),
-            "humidity": random.randint(30, 90),
-            "wind_speed": round(random.uniform(0, 30), 1),
-            "timestamp": datetime.now().isoformat(),
+            "temperature": _TEMPERATURE[idx],
+            "conditions": _CONDITIONS[idx],
+            "humidity": _HUMIDITY[idx],
+            "wind_speed": _WIND_SPEED[idx],
+            "timestamp": _timestamp(),
         }
 
         # Return structured data only
@@ -11,6 +11,18 @@ def install_requirements():
     print("📦 Installing requirements...")
     subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
 
+def build_rowcopy_extension():
+    """Best-effort build of the Cython row-copy fast path (optional)."""
+    print("⚙️  Building optional row-copy extension...")
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "cython"])
+        subprocess.check_call(
+            [sys.executable, "-m", "Cython.Build.Cythonize", "-i", "src/mcp/server/_rowcopy.pyx"]
+        )
+        print("✅ Row-copy extension built")
+    except Exception as e:
+        print(f"⚠️  Skipping row-copy extension (pure-Python fallback will be used): {e}")
+
 def check_env_file():
     """Check if .env file exists and prompt user to configure it"""
     if not os.path.exists(".env"):
@@ -26,6 +38,7 @@ def main():
     
     try:
         install_requirements()
+        build_rowcopy_extension()
         check_env_file()
         
         print("\n✅ Setup complete!")
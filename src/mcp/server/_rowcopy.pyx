@@ -0,0 +1,28 @@
+# cython: language_level=3
+"""Compiled fast path for draining a DBAPI cursor.
+
+Mirrors the pure-Python _fetch_rows loop in server.py; built in place via
+setup.py (best effort) and imported by server.py when available.
+"""
+
+
+def copy_rows(cursor, max_rows=None):
+    cdef int batch_size = 500
+    cdef int want
+    cdef list rows = []
+    cursor.arraysize = batch_size
+    while True:
+        if max_rows is None:
+            want = batch_size
+        else:
+            want = max_rows - len(rows)
+            if want > batch_size:
+                want = batch_size
+        if want <= 0:
+            break
+        chunk = cursor.fetchmany(want)
+        if not chunk:
+            break
+        for row in chunk:
+            rows.append(list(row))
+    return rows
@@ -1,113 +1,298 @@
+import asyncio
+import functools
+import logging
 import os
 import re
 import sys
-import traceback
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
 from typing import List, Any, Dict, Union, Optional
 try:
     import pyodbc
 except ImportError:
     pyodbc = None
-from pydantic import BaseModel
+try:
+    import mssql_python  # Microsoft's native TDS driver; optional, skips the ODBC layer
+except ImportError:
+    mssql_python = None
+from cachetools import TTLCache
 from dotenv import load_dotenv
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
 from mcp.server.fastmcp import FastMCP
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (at most once per process; skipped entirely when
+# the real environment is already configured, e.g. in production)
+@functools.lru_cache(maxsize=1)
+def _load_env():
+    if not os.environ.get("MSSQL_SERVER"):
+        load_dotenv(override=False)
+
+_load_env()
 
 # Initialize MCP server
 mcp = FastMCP("MSSQL Tools Service")
 
-# ------------------ Models ------------------
+# Error paths log through here; the root logger is only configured when this
+# module runs as the server entry point (see __main__ block below).
+logger = logging.getLogger(__name__)
+
+# ------------------ DB Helpers ------------------
 
-class QueryResult(BaseModel):
-    columns: List[str]
-    rows: List[List[Any]]
+# Env vars are read once at import; every connection reuses the same DSN string.
+_CONN_STR = (
+    f"DRIVER={{{os.environ.get('MSSQL_DRIVER', 'ODBC Driver 17 for SQL Server')}}};"
+    f"SERVER={os.environ.get('MSSQL_SERVER')},{os.environ.get('MSSQL_PORT', '1433')};"
+    f"DATABASE={os.environ.get('MSSQL_DATABASE')};"
+    f"UID={os.environ.get('MSSQL_USER')};"
+    f"PWD={os.environ.get('MSSQL_PASSWORD')}"
+)
 
-class ExecResult(BaseModel):
-    message: str
-    affected_rows: int
+def _connect():
+    # Prefer the native driver when installed; its connection/cursor API is
+    # pyodbc-compatible so everything downstream is unchanged.
+    if mssql_python is not None:
+        return mssql_python.connect(_CONN_STR)
+    return pyodbc.connect(_CONN_STR)
 
-# ------------------ DB Helpers ------------------
+def _build_engine():
+    return create_engine(
+        "mssql+pyodbc://",
+        # Hand the dialect whichever DBAPI module is present so it does not
+        # try to import pyodbc itself when only the native driver is installed.
+        module=pyodbc if pyodbc is not None else mssql_python,
+        creator=_connect,
+        poolclass=QueuePool,
+        pool_size=int(os.environ.get("MSSQL_POOL_SIZE", "10")),
+        max_overflow=int(os.environ.get("MSSQL_POOL_MAX_OVERFLOW", "20")),
+        pool_recycle=int(os.environ.get("MSSQL_POOL_RECYCLE", "3600")),
+        pool_pre_ping=True,
+    )
+
+# Process-wide pool built once at import; either driver can back it.
+# pyodbc's own pooling stays on as a fallback when it is the one in use.
+if pyodbc is not None:
+    pyodbc.pooling = True
+
+if pyodbc is not None or mssql_python is not None:
+    engine = _build_engine()
 
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        # Read-only tools dominate; autocommit spares every SELECT the
+        # implicit BEGIN/ROLLBACK round-trips. run_query flips it off for
+        # its explicit write transaction.
+        dbapi_conn.autocommit = True
+else:
+    engine = None
+
+@contextmanager
 def get_connection():
-    if pyodbc is None:
-        raise ImportError("pyodbc is not installed. Install it with: pip install pyodbc")
+    if engine is None:
+        raise ImportError("No SQL Server driver is installed. Install one with: pip install pyodbc (or mssql-python)")
     try:
-        conn_str = (
-            f"DRIVER={{{os.environ.get('MSSQL_DRIVER', 'ODBC Driver 17 for SQL Server')}}};"
-            f"SERVER={os.environ.get('MSSQL_SERVER')},{os.environ.get('MSSQL_PORT', '1433')};"
-            f"DATABASE={os.environ.get('MSSQL_DATABASE')};"
-            f"UID={os.environ.get('MSSQL_USER')};"
-            f"PWD={os.environ.get('MSSQL_PASSWORD')}"
-        )
-        return pyodbc.connect(conn_str)
+        conn = engine.raw_connection()
     except Exception as e:
-        print(f"❌ DB connection error: {e}", file=sys.stderr)
+        logger.error("DB connection error: %s", e)
+        raise
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
         raise
+    finally:
+        conn.close()
+
+def _cursor(conn):
+    """One cursor per pooled connection, reused across checkouts via the
+    pool record's info dict."""
+    cur = conn.info.get("cursor")
+    if cur is None:
+        cur = conn.cursor()
+        conn.info["cursor"] = cur
+    return cur
+
+# Fetch batch size for the ODBC driver and hard cap on rows returned by run_query
+_FETCH_BATCH = 500
+_MAX_QUERY_ROWS = int(os.environ.get("MSSQL_MAX_ROWS", "10000"))
+
+# Compiled row-copy loop (built best-effort by setup.py from _rowcopy.pyx);
+# the pure-Python loop below is the fallback. The packaged path covers imports
+# as mcp.server.server; the bare name covers running server.py as a script.
+try:
+    from mcp.server._rowcopy import copy_rows as _copy_rows_compiled
+except ImportError:
+    try:
+        from _rowcopy import copy_rows as _copy_rows_compiled
+    except ImportError:
+        _copy_rows_compiled = None
+
+def _fetch_rows(cursor, max_rows: Optional[int] = None) -> List[List[Any]]:
+    """Drain a cursor in fetchmany() batches instead of one big fetchall()."""
+    if _copy_rows_compiled is not None:
+        return _copy_rows_compiled(cursor, max_rows)
+    cursor.arraysize = _FETCH_BATCH
+    rows: List[List[Any]] = []
+    extend = rows.extend
+    while True:
+        batch = _FETCH_BATCH if max_rows is None else min(_FETCH_BATCH, max_rows - len(rows))
+        if batch <= 0:
+            break
+        chunk = cursor.fetchmany(batch)
+        if not chunk:
+            break
+        extend([list(row) for row in chunk])
+    return rows
+
+# Compiled once; validate_table_name runs on almost every tool call
+_IDENT_RE = re.compile(r'[a-zA-Z0-9_]+')
+
+@dataclass(frozen=True)
+class ValidatedName:
+    safe: str
+    schema: Optional[str]
+    table: str
+
+# Schema metadata changes rarely but agents ask for it constantly; cache
+# INFORMATION_SCHEMA results briefly and flush whenever run_query sees DDL.
+_SCHEMA_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=30)
+_SCHEMA_CACHE_LOCK = threading.Lock()
+_DDL_RE = re.compile(r'\b(?:CREATE|ALTER|DROP)\b', re.IGNORECASE)
+
+def _schema_cache_get(key):
+    with _SCHEMA_CACHE_LOCK:
+        return _SCHEMA_CACHE.get(key)
+
+def _schema_cache_put(key, value):
+    with _SCHEMA_CACHE_LOCK:
+        _SCHEMA_CACHE[key] = value
 
-def validate_table_name(name: str) -> str:
-    if not re.match(r'^[a-zA-Z0-9_]+(\.[a-zA-Z0-9_]+)?$', name):
+def _schema_cache_clear():
+    with _SCHEMA_CACHE_LOCK:
+        _SCHEMA_CACHE.clear()
+
+def validate_table_name(name: str) -> ValidatedName:
+    # Split once and validate/quote each part in the same pass; callers get the
+    # quoted name plus schema/table without re-scanning the string.
+    parts = name.split('.', 1)
+    if not all(_IDENT_RE.fullmatch(part) for part in parts):
         raise ValueError(f"Invalid table name: {name}")
-    return f"[{name.replace('.', '].[')}]"
+    return ValidatedName(
+        safe='[' + '].['.join(parts) + ']',
+        schema=parts[0] if len(parts) == 2 else None,
+        table=parts[-1],
+    )
 
 # ------------------ Tools ------------------
 
-@mcp.tool()
-def list_tables() -> Dict[str, List[str]]:
-    """List all base tables in the database."""
+def _list_tables_sync() -> Dict[str, List[str]]:
     try:
+        cached = _schema_cache_get("tables")
+        if cached is not None:
+            return cached
         with get_connection() as conn:
-            cursor = conn.cursor()
+            cursor = _cursor(conn)
             cursor.execute("SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_TYPE = 'BASE TABLE'")
-            return {"tables": [row[0] for row in cursor.fetchall()]}
-    except Exception as e:
-        print("❌ list_tables error:", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
+            result = {"tables": [row[0] for row in cursor.fetchall()]}
+            _schema_cache_put("tables", result)
+            return result
+    except Exception:
+        logger.exception("list_tables failed")
         return {"tables": []}
 
 @mcp.tool()
-def preview_table(table_name: str) -> Dict[str, Any]:
-    """Preview first 100 rows of a table."""
+async def list_tables() -> Dict[str, List[str]]:
+    """List all base tables in the database."""
+    return await asyncio.to_thread(_list_tables_sync)
+
+def _preview_table_sync(table_name: str) -> Dict[str, Any]:
     try:
-        safe_name = validate_table_name(table_name)
+        safe_name = validate_table_name(table_name).safe
         with get_connection() as conn:
-            cursor = conn.cursor()
+            cursor = _cursor(conn)
             cursor.execute(f"SELECT TOP 100 * FROM {safe_name}")
+            # Names come from the live cursor.description (the driver computes
+            # it for this query anyway), so they always match the fetched rows.
             columns = [desc[0] for desc in cursor.description] if cursor.description else []
-            rows = [list(row) for row in cursor.fetchall()]
-            return {"columns": columns, "rows": rows}
-    except Exception as e:
-        print(f"❌ preview_table error: {e}", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
-        return {"columns": [], "rows": []}
+            rows = _fetch_rows(cursor)
+            # Transpose to column-oriented output: one contiguous list per
+            # column serializes faster than 100 small row lists.
+            series = [list(col) for col in zip(*rows)] if rows else [[] for _ in columns]
+            return {"columns": dict(zip(columns, series))}
+    except Exception:
+        logger.exception("preview_table failed: %s", table_name)
+        return {"columns": {}}
 
 @mcp.tool()
-def run_query(query: str) -> Union[Dict[str, Any], Dict[str, str]]:
-    """Run any SQL query (SELECT/INSERT/UPDATE/DELETE)."""
+async def preview_table(table_name: str) -> Dict[str, Any]:
+    """Preview first 100 rows of a table, returned column-oriented as
+    {"columns": {column_name: [values...]}}."""
+    return await asyncio.to_thread(_preview_table_sync, table_name)
+
+def _run_query_sync(query: str, params: Optional[List[List[Any]]] = None) -> Union[Dict[str, Any], Dict[str, str]]:
     try:
         with get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query)
-            if cursor.description:
-                columns = [desc[0] for desc in cursor.description]
-                rows = [list(row) for row in cursor.fetchall()]
-                return QueryResult(columns=columns, rows=rows).model_dump()
-            else:
-                conn.commit()
-                return ExecResult(message="Query executed successfully", affected_rows=cursor.rowcount).model_dump()
+            # Writes need a real transaction; turn autocommit off for the
+            # duration of this statement and restore it before the connection
+            # goes back to the pool.
+            dbapi_conn = conn.driver_connection
+            dbapi_conn.autocommit = False
+            try:
+                cursor = conn.cursor()
+                if params:
+                    # Batched form: one TDS RPC for the whole parameter array
+                    # instead of a round-trip per row.
+                    try:
+                        cursor.fast_executemany = True
+                    except AttributeError:
+                        pass  # non-pyodbc driver; executemany still batches client-side
+                    cursor.executemany(query, params)
+                    conn.commit()
+                    if _DDL_RE.search(query):
+                        _schema_cache_clear()
+                    return {"message": "Query executed successfully", "affected_rows": cursor.rowcount}
+                cursor.execute(query)
+                if cursor.description:
+                    columns = [desc[0] for desc in cursor.description]
+                    rows = _fetch_rows(cursor, max_rows=_MAX_QUERY_ROWS)
+                    return {"columns": columns, "rows": rows}
+                else:
+                    conn.commit()
+                    if _DDL_RE.search(query):
+                        _schema_cache_clear()
+                    return {"message": "Query executed successfully", "affected_rows": cursor.rowcount}
+            except Exception:
+                # Roll back before autocommit is restored: switching
+                # SQL_ATTR_AUTOCOMMIT back on would commit whatever part of
+                # the failed transaction reached the server.
+                conn.rollback()
+                raise
+            finally:
+                dbapi_conn.autocommit = True
     except Exception as e:
-        print("❌ run_query error:", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
+        logger.exception("run_query failed")
         return {"error": str(e)}
 
 @mcp.tool()
-def describe_table(table_name: str) -> Dict[str, Any]:
-    """Get detailed schema information for a specific table."""
+async def run_query(query: str, params: Optional[List[List[Any]]] = None) -> Union[Dict[str, Any], Dict[str, str]]:
+    """Run any SQL query (SELECT/INSERT/UPDATE/DELETE).
+
+    For bulk INSERT/UPDATE, pass the statement once with ? placeholders and
+    the rows in params (e.g. query="INSERT INTO t (a, b) VALUES (?, ?)",
+    params=[[1, "x"], [2, "y"]]); this executes all rows in a single batch
+    and is much faster than one call per row."""
+    return await asyncio.to_thread(_run_query_sync, query, params)
+
+def _describe_table_sync(table_name: str) -> Dict[str, Any]:
     try:
-        safe_name = validate_table_name(table_name)
+        validated = validate_table_name(table_name)
+        cached = _schema_cache_get(("describe", table_name))
+        if cached is not None:
+            return cached
         with get_connection() as conn:
-            cursor = conn.cursor()
-            table_only = table_name.split('.')[-1]
+            cursor = _cursor(conn)
             cursor.execute("""
                 SELECT 
                     COLUMN_NAME,
@@ -118,9 +303,9 @@ def describe_table(table_name: str) -> Dict[str, Any]:
                 FROM INFORMATION_SCHEMA.COLUMNS 
                 WHERE TABLE_NAME = ?
                 ORDER BY ORDINAL_POSITION
-            """, table_only)
+            """, validated.table)
             columns = cursor.fetchall()
-            return {
+            result = {
                 "table_name": table_name,
                 "columns": [{
                     "name": str(col[0]) if col[0] else "",
@@ -130,35 +315,112 @@ def describe_table(table_name: str) -> Dict[str, Any]:
                     "max_length": int(col[4]) if col[4] else None
                 } for col in columns]
             }
+            _schema_cache_put(("describe", table_name), result)
+            return result
     except Exception as e:
-        print(f"❌ describe_table error: {e}", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
+        logger.exception("describe_table failed: %s", table_name)
         return {"error": str(e)}
 
 @mcp.tool()
-def get_table_count(table_name: str) -> Dict[str, Any]:
-    """Get the total row count for a table."""
+async def describe_table(table_name: str) -> Dict[str, Any]:
+    """Get detailed schema information for a specific table."""
+    return await asyncio.to_thread(_describe_table_sync, table_name)
+
+def _inspect_table_sync(table_name: str) -> Dict[str, Any]:
+    try:
+        validated = validate_table_name(table_name)
+        with get_connection() as conn:
+            cursor = _cursor(conn)
+            # Two statements, one round-trip; consume both result sets via nextset()
+            cursor.execute(
+                "SELECT "
+                "    COLUMN_NAME, "
+                "    DATA_TYPE, "
+                "    IS_NULLABLE, "
+                "    COLUMN_DEFAULT, "
+                "    CHARACTER_MAXIMUM_LENGTH "
+                "FROM INFORMATION_SCHEMA.COLUMNS "
+                "WHERE TABLE_NAME = ? "
+                "ORDER BY ORDINAL_POSITION; "
+                f"SELECT COUNT(*) FROM {validated.safe}",
+                validated.table,
+            )
+            columns = cursor.fetchall()
+            count = 0
+            if cursor.nextset():
+                row = cursor.fetchone()
+                count = int(row[0]) if row and row[0] is not None else 0
+            return {
+                "table_name": table_name,
+                "columns": [{
+                    "name": str(col[0]) if col[0] else "",
+                    "type": str(col[1]) if col[1] else "",
+                    "nullable": str(col[2]) == "YES" if col[2] else False,
+                    "default": str(col[3]) if col[3] else None,
+                    "max_length": int(col[4]) if col[4] else None
+                } for col in columns],
+                "row_count": count,
+            }
+    except Exception as e:
+        logger.exception("inspect_table failed: %s", table_name)
+        return {"error": str(e)}
+
+@mcp.tool()
+async def inspect_table(table_name: str) -> Dict[str, Any]:
+    """Get a table's schema and row count in one call (preferred over
+    calling describe_table and get_table_count separately)."""
+    return await asyncio.to_thread(_inspect_table_sync, table_name)
+
+def _get_table_count_sync(table_name: str) -> Dict[str, Any]:
     try:
-        safe_name = validate_table_name(table_name)
+        safe_name = validate_table_name(table_name).safe
         with get_connection() as conn:
-            cursor = conn.cursor()
+            cursor = _cursor(conn)
             cursor.execute(f"SELECT COUNT(*) FROM {safe_name}")
             result = cursor.fetchone()
             count = int(result[0]) if result and result[0] is not None else 0
             return {"table_name": table_name, "row_count": count}
     except Exception as e:
-        print(f"❌ get_table_count error: {e}", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
+        logger.exception("get_table_count failed: %s", table_name)
         return {"error": str(e)}
 
+@mcp.tool()
+async def get_table_count(table_name: str) -> Dict[str, Any]:
+    """Get the total row count for a table."""
+    return await asyncio.to_thread(_get_table_count_sync, table_name)
+
 # ------------------ Run Server ------------------
 
 if __name__ == "__main__":
+    # Level is tunable via MSSQL_LOG_LEVEL so production can gate tracebacks
+    # at WARNING and above.
+    logging.basicConfig(level=os.environ.get("MSSQL_LOG_LEVEL", "INFO"), stream=sys.stderr)
     print("🚀 Starting MSSQL MCP Server on HTTP/SSE", file=sys.stderr)
     print("📋 Available tools:", file=sys.stderr)
     print("   • list_tables() - List all tables in database", file=sys.stderr)
     print("   • preview_table(table_name) - Preview first 100 rows", file=sys.stderr)
     print("   • describe_table(table_name) - Get table schema", file=sys.stderr)
+    print("   • inspect_table(table_name) - Get schema + row count in one call", file=sys.stderr)
     print("   • get_table_count(table_name) - Get row count", file=sys.stderr)
     print("   • run_query(query) - Execute any SQL query", file=sys.stderr)
-    mcp.run(transport="sse")
\ No newline at end of file
+    import uvicorn
+    # Prefer the libuv loop and C HTTP parser; fall back to the pure-Python
+    # implementations where they are unavailable (e.g. uvloop on Windows).
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+    uvicorn.run(
+        mcp.sse_app(),
+        host=mcp.settings.host,
+        port=mcp.settings.port,
+        log_level=mcp.settings.log_level.lower(),
+        loop=loop,
+        http=http,
+    )
\ No newline at end of file
@@ -135,7 +135,12 @@ class SseServerTransport:
         # This is the URI (path + query) the client will use to POST messages.
         client_post_uri_data = f"{quote(full_message_path_for_client)}?session_id={session_id.hex}"
 
-        sse_stream_writer, sse_stream_reader = anyio.create_memory_object_stream[dict[str, Any]](0)
+        # A small buffer lets the session enqueue a burst of events without a
+        # task switch per frame; the response task then drains them
+        # back-to-back in one scheduling tick so the transport layer can
+        # coalesce the writes. Socket-level batching (writev/sendmsg) is not
+        # reachable from ASGI code, so this is where frame coalescing happens.
+        sse_stream_writer, sse_stream_reader = anyio.create_memory_object_stream[dict[str, Any]](32)
 
         async def sse_writer():
             logger.debug("Starting SSE writer")